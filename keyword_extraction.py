@@ -6,11 +6,19 @@ Supports both statistical and AI-based approaches for legal-specific term extrac
 """
 
 import argparse
+import asyncio
+import os
 import re
-from typing import List, Dict, Any, Set, Tuple
-from pathlib import Path
+import shutil
+import tempfile
+import threading
 from collections import Counter
+from typing import List, Dict, Any, Set, Tuple, Optional, Iterator
+from pathlib import Path
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 try:
     from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
@@ -20,19 +28,130 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
     print("Warning: transformers library not available. Using statistical keyword extraction.")
 
+try:
+    from optimum.onnxruntime import ORTModelForTokenClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    OPTIMUM_AVAILABLE = True
+except ImportError:
+    OPTIMUM_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def score_keywords(frequencies: np.ndarray, is_legal: np.ndarray) -> np.ndarray:
+        """Score keywords by frequency, doubling the score of legal category terms."""
+        scores = np.empty_like(frequencies)
+        for i in range(frequencies.size):
+            scores[i] = frequencies[i] * (2 if is_legal[i] else 1)
+        return scores
+else:
+    def score_keywords(frequencies: np.ndarray, is_legal: np.ndarray) -> np.ndarray:
+        """Score keywords by frequency, doubling the score of legal category terms."""
+        return frequencies * np.where(is_legal, 2, 1)
+
+
+def cpu_supports_vnni() -> bool:
+    """
+    Check whether the CPU exposes AVX-512 VNNI instructions for INT8 matmul.
+    
+    Returns:
+        True if the avx512_vnni flag is reported by the CPU
+    """
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
+            return 'avx512_vnni' in f.read()
+    except OSError:
+        return False
+
 
 class LegalKeywordExtractor:
     """A class for extracting keywords and phrases from legal documents."""
     
-    def __init__(self, model_name: str = "dbmdz/bert-large-cased-finetuned-conll03-english"):
+    # Common stop words excluded from statistical keyword extraction
+    STOP_WORDS = frozenset({
+        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
+        'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be',
+        'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+        'will', 'would', 'could', 'should', 'may', 'might', 'can',
+        'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she',
+        'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
+    })
+    
+    # Phrase patterns for key phrase extraction
+    PHRASE_PATTERNS = [
+        # Legal clause patterns
+        r'\b(subject to|in accordance with|pursuant to|with respect to|in the event of|provided that|notwithstanding|for the purpose of)\b[^.!?]*[.!?]',
+        
+        # Agreement patterns
+        r'\b(the parties agree|it is agreed|the tenant shall|the landlord shall|this agreement|the term of|in consideration of)\b[^.!?]*[.!?]',
+        
+        # Obligation patterns
+        r'\b(shall be responsible for|shall maintain|shall provide|shall pay|shall deliver|shall perform|shall comply with)\b[^.!?]*[.!?]',
+        
+        # Condition patterns
+        r'\b(if and only if|unless and until|in the event that|on condition that|provided however)\b[^.!?]*[.!?]',
+        
+        # Termination patterns
+        r'\b(may be terminated|shall terminate|upon termination|in case of termination|termination shall)\b[^.!?]*[.!?]',
+        
+        # Notice patterns
+        r'\b(written notice|notice shall be|upon receipt of notice|notice is hereby given)\b[^.!?]*[.!?]'
+    ]
+    
+    # Precompiled patterns
+    _PHRASE_PATTERN_RES = [re.compile(pattern, re.IGNORECASE) for pattern in PHRASE_PATTERNS]
+    _TRAILING_PUNCT_RE = re.compile(r'[.!?]+$')
+    _WS_RE = re.compile(r'\s+')
+    _LEGAL_PHRASE_RE = re.compile(r'\b(WHEREAS|NOW THEREFORE|IN WITNESS WHEREOF)\b')
+    _WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+    
+    def __init__(self, model_name: str = "dbmdz/bert-large-cased-finetuned-conll03-english",
+                 batch_size: int = 16, use_half_precision: bool = True, use_onnx: bool = True,
+                 onnx_cache_dir: Optional[str] = None, quantize_cpu: bool = True):
         """
         Initialize the keyword extractor.
         
         Args:
             model_name: Hugging Face model name for NER
+            batch_size: Number of chunks per NER forward pass
+            use_half_precision: Load the NER model in fp16 when running on CUDA
+            use_onnx: On CPU, run a quantized ONNX Runtime export of the model when optimum is installed
+            onnx_cache_dir: Directory for exported and quantized ONNX models
+                (defaults to ~/.cache/legal_keyword_extraction/onnx)
+            quantize_cpu: On VNNI-capable CPUs, apply dynamic int8 quantization to the PyTorch model
         """
         self.model_name = model_name
+        self.batch_size = batch_size
+        self.use_half_precision = use_half_precision
+        self.use_onnx = use_onnx
+        self.quantize_cpu = quantize_cpu
+        self.onnx_cache_dir = onnx_cache_dir or str(Path.home() / '.cache' / 'legal_keyword_extraction' / 'onnx')
         self.ner_pipeline = None
+        self._ner_lock = threading.Lock()
         
         # Legal domain-specific terms
         self.legal_categories = {
@@ -72,20 +191,128 @@ class LegalKeywordExtractor:
             ]
         }
         
+        # Invert categories for O(1) lookup; the first category listing a term wins
+        self._term_to_category = {}
+        for category, terms in self.legal_categories.items():
+            for term in terms:
+                self._term_to_category.setdefault(term.lower(), category)
+        
+        # Multi-word category terms never appear as single tokens, so match them on the raw text
+        multi_word_terms = sorted(term for term in self._term_to_category if ' ' in term)
+        if AHOCORASICK_AVAILABLE:
+            self.category_automaton = ahocorasick.Automaton()
+            for term in multi_word_terms:
+                self.category_automaton.add_word(term, term)
+            self.category_automaton.make_automaton()
+        else:
+            self.category_automaton = None
+            self._category_phrase_re = re.compile(
+                r'\b(?:' + '|'.join(re.escape(term) for term in multi_word_terms) + r')\b'
+            )
+        
+        # Compile phrase patterns into a Hyperscan database if available
+        self.phrase_database = None
+        # The database's scratch space cannot be used by two threads at once
+        self._phrase_scan_lock = threading.Lock()
+        if HYPERSCAN_AVAILABLE:
+            try:
+                self.phrase_database = hyperscan.Database()
+                self.phrase_database.compile(
+                    expressions=[pattern.encode('utf-8') for pattern in self.PHRASE_PATTERNS],
+                    ids=list(range(len(self.PHRASE_PATTERNS))),
+                    elements=len(self.PHRASE_PATTERNS),
+                    flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(self.PHRASE_PATTERNS)
+                )
+            except Exception as e:
+                print(f"Error compiling Hyperscan database: {e}")
+                self.phrase_database = None
+        
         # Initialize NER pipeline if available
         if TRANSFORMERS_AVAILABLE:
             try:
+                model = None
+                if use_onnx and OPTIMUM_AVAILABLE and not torch.cuda.is_available():
+                    try:
+                        model = self.load_onnx_model()
+                    except Exception as e:
+                        print(f"Error loading ONNX model: {e}")
+                        print("Falling back to the PyTorch model")
+                
+                if model is None:
+                    dtype = self.select_dtype() if use_half_precision else torch.float32
+                    model = AutoModelForTokenClassification.from_pretrained(model_name, torch_dtype=dtype)
+                    
+                    # fp32 on a VNNI-capable CPU: quantize linear layers so fbgemm/oneDNN use INT8 VNNI kernels
+                    if (quantize_cpu and dtype == torch.float32 and not torch.cuda.is_available()
+                            and torch.backends.mkldnn.is_available() and cpu_supports_vnni()):
+                        model = torch.ao.quantization.quantize_dynamic(
+                            model, {torch.nn.Linear}, dtype=torch.qint8
+                        )
+                tokenizer = AutoTokenizer.from_pretrained(model_name)
                 self.ner_pipeline = pipeline(
                     "ner",
-                    model=model_name,
-                    tokenizer=model_name,
+                    model=model,
+                    tokenizer=tokenizer,
                     device=0 if torch.cuda.is_available() else -1,
-                    aggregation_strategy="simple"
+                    aggregation_strategy="simple",
+                    batch_size=batch_size
                 )
             except Exception as e:
                 print(f"Error loading NER model: {e}")
                 self.ner_pipeline = None
     
+    def load_onnx_model(self) -> "ORTModelForTokenClassification":
+        """
+        Load an ONNX Runtime export of the NER model with INT8 dynamic quantization.
+        
+        The model is exported and quantized on first use and cached on disk. The quantized
+        model is built in a temporary directory and moved into place only once complete,
+        so an interrupted run never leaves a cache entry that looks valid.
+        
+        Returns:
+            Quantized ONNX Runtime token classification model
+        """
+        # Prefer VNNI INT8 kernels when the CPU has them
+        if cpu_supports_vnni():
+            config_name = 'avx512_vnni'
+            quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        else:
+            config_name = 'avx2'
+            quantization_config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        
+        export_dir = Path(self.onnx_cache_dir) / self.model_name.replace('/', '--')
+        quantized_dir = export_dir / f'quantized-{config_name}'
+        
+        if not (quantized_dir / 'model_quantized.onnx').exists():
+            export_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.TemporaryDirectory(dir=export_dir) as tmp_dir:
+                model = ORTModelForTokenClassification.from_pretrained(self.model_name, export=True)
+                model.save_pretrained(Path(tmp_dir) / 'export')
+                quantizer = ORTQuantizer.from_pretrained(model)
+                quantizer.quantize(save_dir=Path(tmp_dir) / 'quantized', quantization_config=quantization_config)
+                
+                # Remove leftovers of an interrupted run, then publish the finished model
+                shutil.rmtree(quantized_dir, ignore_errors=True)
+                os.replace(Path(tmp_dir) / 'quantized', quantized_dir)
+        
+        return ORTModelForTokenClassification.from_pretrained(quantized_dir, file_name='model_quantized.onnx')
+    
+    @staticmethod
+    def select_dtype() -> "torch.dtype":
+        """
+        Select the fastest numerically safe dtype for NER inference.
+        
+        bfloat16 is avoided: older transformers releases call .numpy() on the raw logits
+        in token classification postprocessing, which fails for bf16 tensors.
+        
+        Returns:
+            float16 on CUDA, else float32
+        """
+        if torch.cuda.is_available():
+            return torch.float16
+        
+        return torch.float32
+    
     def preprocess_text(self, text: str) -> str:
         """
         Preprocess text for keyword extraction.
@@ -97,16 +324,56 @@ class LegalKeywordExtractor:
             Preprocessed text
         """
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = self._WS_RE.sub(' ', text)
         
         # Normalize legal phrases
-        text = re.sub(r'\b(WHEREAS|NOW THEREFORE|IN WITNESS WHEREOF)\b', 
-                     lambda m: m.group(1).lower(), text)
+        text = self._LEGAL_PHRASE_RE.sub(lambda m: m.group(1).lower(), text)
         
         return text.strip()
     
+    def tokenize_words(self, text_lower: str) -> List[str]:
+        """
+        Tokenize lowercased text into alphabetic words.
+        
+        Args:
+            text_lower: Lowercased input text
+            
+        Returns:
+            List of lowercase words
+        """
+        return self._WORD_RE.findall(text_lower)
+    
+    def count_category_phrases(self, text_lower: str) -> Dict[str, int]:
+        """
+        Count occurrences of multi-word legal category terms in a single pass.
+        
+        Args:
+            text_lower: Lowercased input text
+            
+        Returns:
+            Dictionary mapping each matched term to its frequency
+        """
+        counts = {}
+        
+        if self.category_automaton is not None:
+            for end, term in self.category_automaton.iter(text_lower):
+                start = end - len(term) + 1
+                # Only count whole-word matches, using the same word characters as regex \b
+                if start > 0 and (text_lower[start - 1].isalnum() or text_lower[start - 1] == '_'):
+                    continue
+                if end + 1 < len(text_lower) and (text_lower[end + 1].isalnum() or text_lower[end + 1] == '_'):
+                    continue
+                counts[term] = counts.get(term, 0) + 1
+        else:
+            for term in self._category_phrase_re.findall(text_lower):
+                counts[term] = counts.get(term, 0) + 1
+        
+        return counts
+    
     def extract_statistical_keywords(self, text: str, min_freq: int = 2, 
-                                   max_keywords: int = 50) -> List[Dict[str, Any]]:
+                                   max_keywords: int = 50,
+                                   words: Optional[List[str]] = None,
+                                   text_lower: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Extract keywords using statistical methods.
         
@@ -114,24 +381,23 @@ class LegalKeywordExtractor:
             text: Input text
             min_freq: Minimum frequency for keyword inclusion
             max_keywords: Maximum number of keywords to return
+            words: Words already produced by tokenize_words for this text, if available
+            text_lower: Lowercased text, if the caller has already computed it
             
         Returns:
             List of keyword dictionaries
         """
+        # Lowercase once and share it between tokenization and phrase counting
+        if text_lower is None:
+            text_lower = text.lower()
+        
         # Tokenize and filter words
-        words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
+        if words is None:
+            words = self.tokenize_words(text_lower)
         
         # Filter out common stop words and short words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
-            'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be',
-            'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
-            'will', 'would', 'could', 'should', 'may', 'might', 'can',
-            'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she',
-            'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
-        }
-        
-        filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
+        stop_words = self.STOP_WORDS
+        filtered_words = [word for word in words if len(word) > 2 and word not in stop_words]
         
         # Count word frequencies
         word_freq = Counter(filtered_words)
@@ -139,20 +405,29 @@ class LegalKeywordExtractor:
         # Filter by minimum frequency
         frequent_words = {word: freq for word, freq in word_freq.items() if freq >= min_freq}
         
-        # Categorize words
-        keywords = []
-        for word, freq in frequent_words.items():
-            category = self.categorize_word(word)
-            keywords.append({
-                'term': word,
-                'frequency': freq,
-                'category': category,
-                'score': freq * (2 if category != 'general' else 1)
-            })
-        
-        # Sort by score and return top keywords
-        keywords.sort(key=lambda x: x['score'], reverse=True)
-        return keywords[:max_keywords]
+        # Add multi-word category terms such as "real estate"
+        for term, freq in self.count_category_phrases(text_lower).items():
+            if freq >= min_freq:
+                frequent_words[term] = freq
+        
+        # Categorize words; they are already lowercase, so look up the category directly
+        terms = list(frequent_words)
+        categories = [self._term_to_category.get(term, 'general') for term in terms]
+        frequencies = np.fromiter(frequent_words.values(), dtype=np.int64, count=len(terms))
+        is_legal = np.array([category != 'general' for category in categories], dtype=np.bool_)
+        scores = score_keywords(frequencies, is_legal)
+        
+        # Stable sort by descending score and return top keywords
+        top = np.argsort(-scores, kind='stable')[:max_keywords].tolist()
+        return [
+            {
+                'term': terms[i],
+                'frequency': int(frequencies[i]),
+                'category': categories[i],
+                'score': int(scores[i])
+            }
+            for i in top
+        ]
     
     def categorize_word(self, word: str) -> str:
         """
@@ -164,13 +439,55 @@ class LegalKeywordExtractor:
         Returns:
             Category name
         """
-        word_lower = word.lower()
+        return self._term_to_category.get(word.lower(), 'general')
+    
+    def _scan_phrases_regex(self, text: str) -> List[str]:
+        """
+        Scan text with each precompiled phrase pattern in turn.
         
-        for category, terms in self.legal_categories.items():
-            if word_lower in terms:
-                return category
+        Args:
+            text: Input text
+            
+        Returns:
+            List of trigger phrases, grouped by pattern in pattern order
+        """
+        return [trigger for pattern in self._PHRASE_PATTERN_RES for trigger in pattern.findall(text)]
+    
+    def _scan_phrases_hyperscan(self, text: str) -> List[str]:
+        """
+        Scan text for all phrase patterns at once with the Hyperscan database.
         
-        return 'general'
+        Args:
+            text: Input text
+            
+        Returns:
+            List of trigger phrases, grouped by pattern in pattern order as with the regex scan
+        """
+        data = text.encode('utf-8')
+        spans = []
+        
+        def on_match(pattern_id, start, end, flags, context):
+            spans.append((pattern_id, start, end))
+        
+        with self._phrase_scan_lock:
+            self.phrase_database.scan(data, match_event_handler=on_match)
+        
+        # Hyperscan reports offsets only; recover the trigger group with an anchored match
+        candidates = []
+        for pattern_id, start, end in spans:
+            match = self._PHRASE_PATTERN_RES[pattern_id].match(data[start:end].decode('utf-8', 'ignore'))
+            if match:
+                candidates.append((pattern_id, start, end, match.group(1)))
+        
+        # Each pattern resumes after its previous match, as a separate findall per pattern would
+        matches = []
+        resume_at = [0] * len(self.PHRASE_PATTERNS)
+        for pattern_id, start, end, trigger in sorted(candidates):
+            if start >= resume_at[pattern_id]:
+                resume_at[pattern_id] = end
+                matches.append(trigger)
+        
+        return matches
     
     def extract_key_phrases(self, text: str, max_phrases: int = 20) -> List[str]:
         """
@@ -185,82 +502,126 @@ class LegalKeywordExtractor:
         """
         phrases = []
         
-        # Define phrase patterns
-        patterns = [
-            # Legal clause patterns
-            r'\b(subject to|in accordance with|pursuant to|with respect to|in the event of|provided that|notwithstanding|for the purpose of)\b[^.!?]*[.!?]',
-            
-            # Agreement patterns
-            r'\b(the parties agree|it is agreed|the tenant shall|the landlord shall|this agreement|the term of|in consideration of)\b[^.!?]*[.!?]',
-            
-            # Obligation patterns
-            r'\b(shall be responsible for|shall maintain|shall provide|shall pay|shall deliver|shall perform|shall comply with)\b[^.!?]*[.!?]',
-            
-            # Condition patterns
-            r'\b(if and only if|unless and until|in the event that|on condition that|provided however)\b[^.!?]*[.!?]',
-            
-            # Termination patterns
-            r'\b(may be terminated|shall terminate|upon termination|in case of termination|termination shall)\b[^.!?]*[.!?]',
-            
-            # Notice patterns
-            r'\b(written notice|notice shall be|upon receipt of notice|notice is hereby given)\b[^.!?]*[.!?]'
-        ]
+        if self.phrase_database is not None:
+            matches = self._scan_phrases_hyperscan(text)
+        else:
+            matches = self._scan_phrases_regex(text)
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                cleaned_phrase = re.sub(r'[.!?]+$', '', match.strip())
-                if 20 <= len(cleaned_phrase) <= 200:
-                    phrases.append(cleaned_phrase)
+        for trigger in matches:
+            cleaned_phrase = self._TRAILING_PUNCT_RE.sub('', trigger.strip())
+            if 20 <= len(cleaned_phrase) <= 200:
+                phrases.append(cleaned_phrase)
         
         # Remove duplicates and return top phrases
         unique_phrases = list(dict.fromkeys(phrases))
         return unique_phrases[:max_phrases]
     
-    def extract_named_entities(self, text: str) -> List[Dict[str, Any]]:
+    def split_into_windows(self, text: str, max_length: int = 512,
+                           stride: int = 64) -> List[Tuple[str, int]]:
         """
-        Extract named entities using NER model.
+        Split text into overlapping windows that fit the NER model's token limit.
+        
+        The text is tokenized once; each overflowing window is mapped back to its
+        character span so the pipeline never receives more than max_length tokens.
         
         Args:
             text: Input text
+            max_length: Maximum number of tokens per window
+            stride: Number of overlapping tokens between consecutive windows
             
         Returns:
-            List of named entities
+            List of (window string, token count) tuples
         """
-        if not self.ner_pipeline:
-            return []
+        encoding = self.ner_pipeline.tokenizer(
+            text,
+            max_length=max_length,
+            stride=stride,
+            truncation=True,
+            return_overflowing_tokens=True,
+            return_offsets_mapping=True
+        )
+        
+        windows = []
+        for offsets in encoding['offset_mapping']:
+            # Special tokens map to (0, 0); skip them when locating the span
+            spans = [(start, end) for start, end in offsets if end > start]
+            if spans:
+                windows.append((text[spans[0][0]:spans[-1][1]], len(spans)))
+        
+        return windows
+    
+    def stream_named_entities(self, text: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield deduplicated named entities as NER batches complete.
         
-        try:
-            # Split text into chunks for processing
-            max_length = 512
-            chunks = []
-            words = text.split()
+        Args:
+            text: Input text
             
-            for i in range(0, len(words), max_length):
-                chunk = ' '.join(words[i:i + max_length])
-                chunks.append(chunk)
+        Yields:
+            Named entity dictionaries in document order
+        """
+        if not self.ner_pipeline:
+            return
+        
+        # The pipeline's fast tokenizer is stateful and not safe to share across threads,
+        # so concurrent documents take turns on the model
+        with self._ner_lock:
+            # Split text into token-bounded windows for processing
+            windows = self.split_into_windows(text)
+            if not windows:
+                return
             
-            # Process each chunk
-            all_entities = []
-            for chunk in chunks:
-                entities = self.ner_pipeline(chunk)
-                all_entities.extend(entities)
+            # Batch windows sorted by token length so each batch pads as little as possible;
+            # passing a generator makes the pipeline yield outputs batch by batch
+            order = sorted(range(len(windows)), key=lambda idx: windows[idx][1])
+            outputs = self.ner_pipeline((windows[idx][0] for idx in order), batch_size=self.batch_size)
             
-            # Filter and deduplicate entities
-            filtered_entities = []
+            # Filter and deduplicate entities, releasing windows in document order
             seen_entities = set()
+            pending = {}
+            next_idx = 0
+            for idx, entities in zip(order, outputs):
+                pending[idx] = entities
+                while next_idx in pending:
+                    yield from self._filter_new_entities(pending.pop(next_idx), seen_entities)
+                    next_idx += 1
+    
+    def _filter_new_entities(self, entities: List[Dict[str, Any]],
+                             seen_entities: Set[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield entities not seen before, recording them in seen_entities.
+        
+        Args:
+            entities: Raw pipeline entities for one window
+            seen_entities: Lowercased entity texts already yielded
             
-            for entity in all_entities:
-                entity_text = entity['word'].lower()
-                if entity_text not in seen_entities and len(entity_text) > 2:
-                    filtered_entities.append({
-                        'text': entity['word'],
-                        'label': entity['entity_group'],
-                        'confidence': entity['score']
-                    })
-                    seen_entities.add(entity_text)
+        Yields:
+            Named entity dictionaries
+        """
+        for entity in entities:
+            # Strip subword markers so "##ing" collapses onto "ing"
+            entity_text = entity['word'].lstrip('#').lower()
+            if entity_text in seen_entities or len(entity_text) <= 2:
+                continue
+            seen_entities.add(entity_text)
+            yield {
+                'text': entity['word'],
+                'label': entity['entity_group'],
+                'confidence': float(entity['score'])
+            }
+    
+    def extract_named_entities(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Extract named entities using NER model.
+        
+        Args:
+            text: Input text
             
-            return filtered_entities
+        Returns:
+            List of named entities
+        """
+        try:
+            return list(self.stream_named_entities(text))
         
         except Exception as e:
             print(f"Error in named entity extraction: {e}")
@@ -277,9 +638,11 @@ class LegalKeywordExtractor:
             Dictionary containing all extracted information
         """
         processed_text = self.preprocess_text(text)
+        text_lower = processed_text.lower()
+        words = self.tokenize_words(text_lower)
         
         # Extract statistical keywords
-        keywords = self.extract_statistical_keywords(processed_text)
+        keywords = self.extract_statistical_keywords(processed_text, words=words, text_lower=text_lower)
         
         # Extract key phrases
         phrases = self.extract_key_phrases(processed_text)
@@ -288,7 +651,8 @@ class LegalKeywordExtractor:
         entities = self.extract_named_entities(processed_text)
         
         # Calculate statistics
-        word_count = len(processed_text.split())
+        # Whitespace is already collapsed to single spaces, so counting separators is exact
+        word_count = processed_text.count(' ') + 1 if processed_text else 0
         unique_keywords = len(set(kw['term'] for kw in keywords))
         
         # Categorize keywords
@@ -310,15 +674,66 @@ class LegalKeywordExtractor:
             }
         }
     
+    async def extract_batch(self, texts: List[str], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Extract keywords from many documents concurrently.
+        
+        Each document runs extract_all_keywords in a worker thread, with at most
+        max_concurrency documents in flight at once.
+        
+        Args:
+            texts: Input document texts
+            max_concurrency: Maximum number of documents processed concurrently
+            
+        Returns:
+            List of extraction results, in the same order as texts
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        loop = asyncio.get_running_loop()
+        
+        async def extract_one(text: str) -> Dict[str, Any]:
+            async with semaphore:
+                # run_in_executor rather than asyncio.to_thread keeps Python 3.8 support
+                return await loop.run_in_executor(None, self.extract_all_keywords, text)
+        
+        return await asyncio.gather(*(extract_one(text) for text in texts))
+    
     def save_results(self, results: Dict[str, Any], output_path: str, original_filename: str):
         """
         Save extraction results to file.
         
+        The text report and its JSON counterpart are written concurrently.
+        
         Args:
             results: Extraction results dictionary
             output_path: Path to save the output file
             original_filename: Original filename for reference
         """
+        json_path = str(Path(output_path).with_suffix('.json'))
+        
+        # Writing both to the same file concurrently would interleave them; keep the JSON as the final write
+        if Path(json_path) == Path(output_path):
+            self.write_text_report(results, output_path, original_filename)
+            self.write_json_report(results, json_path)
+            return
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.write_text_report, results, output_path, original_filename),
+                executor.submit(self.write_json_report, results, json_path)
+            ]
+            for future in futures:
+                future.result()
+    
+    def write_text_report(self, results: Dict[str, Any], output_path: str, original_filename: str):
+        """
+        Write the human-readable extraction report.
+        
+        Args:
+            results: Extraction results dictionary
+            output_path: Path to save the report
+            original_filename: Original filename for reference
+        """
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(f"KEYWORD EXTRACTION REPORT\n")
             f.write(f"{'=' * 50}\n\n")
@@ -359,28 +774,48 @@ class LegalKeywordExtractor:
                 f.write(f"{'-' * 30}\n")
                 for entity in results['named_entities']:
                     f.write(f"{entity['text']} ({entity['label']}) - {entity['confidence']:.3f}\n")
+    
+    def write_json_report(self, results: Dict[str, Any], json_path: str):
+        """
+        Write the extraction results as JSON.
         
-        # Also save as JSON
-        json_path = output_path.replace('.txt', '.json')
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        Args:
+            results: Extraction results dictionary
+            json_path: Path to save the JSON file
+        """
+        if ORJSON_AVAILABLE:
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
 
 
 def main():
     """Main function to run the keyword extraction script."""
     parser = argparse.ArgumentParser(description='Extract keywords from legal documents')
-    parser.add_argument('input_file', help='Input text file path')
-    parser.add_argument('--output', '-o', default='keywords_output.txt', help='Output file path')
+    parser.add_argument('input_file', help='Input text file path (or directory with --batch)')
+    parser.add_argument('--output', '-o', default='keywords_output.txt',
+                       help='Output file path (used as a name prefix with --batch)')
     parser.add_argument('--min-freq', type=int, default=2, help='Minimum keyword frequency')
     parser.add_argument('--max-keywords', type=int, default=50, help='Maximum number of keywords')
     parser.add_argument('--model', '-m', default='dbmdz/bert-large-cased-finetuned-conll03-english',
                        help='Hugging Face NER model name')
+    parser.add_argument('--batch-size', type=int, default=16, help='NER inference batch size')
+    parser.add_argument('--batch', action='store_true',
+                       help='Process every .txt file in the input directory concurrently')
+    parser.add_argument('--max-concurrency', type=int, default=8,
+                       help='Maximum documents processed concurrently with --batch')
     
     args = parser.parse_args()
     
+    if args.batch:
+        run_batch(args)
+        return
+    
     # Read input file
     try:
-        with open(args.input_file, 'r', encoding='utf-8') as f:
+        with open(args.input_file, 'r', encoding='utf-8', buffering=2**20) as f:
             text = f.read()
     except FileNotFoundError:
         print(f"Error: File '{args.input_file}' not found.")
@@ -390,7 +825,7 @@ def main():
         return
     
     # Initialize extractor
-    extractor = LegalKeywordExtractor(model_name=args.model)
+    extractor = LegalKeywordExtractor(model_name=args.model, batch_size=args.batch_size)
     
     # Extract keywords
     print(f"Extracting keywords from: {args.input_file}")
@@ -406,7 +841,48 @@ def main():
     print(f"Key phrases found: {len(results['key_phrases'])}")
     print(f"Named entities found: {len(results['named_entities'])}")
     print(f"Results saved to: {args.output}")
-    print(f"JSON output saved to: {args.output.replace('.txt', '.json')}")
+    print(f"JSON output saved to: {Path(args.output).with_suffix('.json')}")
+
+
+def run_batch(args: argparse.Namespace):
+    """Extract keywords from every .txt file in a directory concurrently."""
+    # Skip reports written by earlier runs with the same output prefix
+    output_path = Path(args.output)
+    report_prefix = f"{output_path.stem}_"
+    input_files = [
+        input_file for input_file in sorted(Path(args.input_file).glob('*.txt'))
+        if not input_file.name.startswith(report_prefix) and input_file.name != output_path.name
+    ]
+    
+    documents = []
+    texts = []
+    for input_file in input_files:
+        try:
+            with open(input_file, 'r', encoding='utf-8', buffering=2**20) as f:
+                texts.append(f.read())
+            documents.append(input_file)
+        except Exception as e:
+            print(f"Error reading file '{input_file}': {e}")
+    
+    if not documents:
+        print(f"Error: No readable .txt files found in '{args.input_file}'.")
+        return
+    
+    # Initialize extractor
+    extractor = LegalKeywordExtractor(model_name=args.model, batch_size=args.batch_size)
+    
+    print(f"Extracting keywords from {len(documents)} documents in: {args.input_file}")
+    print(f"Using model: {args.model}")
+    
+    all_results = asyncio.run(extractor.extract_batch(texts, max_concurrency=args.max_concurrency))
+    
+    # Save results, one report per document
+    for input_file, results in zip(documents, all_results):
+        document_output = str(output_path.with_name(f"{output_path.stem}_{input_file.stem}{output_path.suffix}"))
+        extractor.save_results(results, document_output, input_file.name)
+        print(f"{input_file.name}: {len(results['keywords'])} keywords -> {document_output}")
+    
+    print(f"\nBatch keyword extraction complete!")
 
 
 if __name__ == "__main__":
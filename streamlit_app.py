@@ -10,19 +10,83 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 import re
 from collections import Counter
 from typing import List, Dict, Any
 import io
 import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import our custom modules
 from scripts.text_chunking import TextChunker
-from scripts.summarization import LegalDocumentSummarizer
+from scripts.summarization import get_summarizer
 from scripts.keyword_extraction import LegalKeywordExtractor
 
 
+@st.cache_resource
+def get_chunker(chunk_size: int, overlap: int, method: str) -> TextChunker:
+    """Return a shared TextChunker for the given settings."""
+    return TextChunker(chunk_size=chunk_size, overlap=overlap, method=method)
+
+
+@st.cache_resource
+def get_extractor(model_name: str = "dbmdz/bert-large-cased-finetuned-conll03-english") -> LegalKeywordExtractor:
+    """Load the NER model once per process."""
+    return LegalKeywordExtractor(model_name=model_name)
+
+
+def text_digest(text: str) -> str:
+    """Return a short content hash used as a cache key for document text."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_chunk(text_hash: str, method: str, size: int, overlap: int, _text: str) -> List[Dict[str, Any]]:
+    """Chunk a document, cached on its content hash and chunking settings."""
+    return get_chunker(size, overlap, method).process_document(_text)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_keywords(text_hash: str, _text: str) -> Dict[str, Any]:
+    """Extract keywords from a document, cached on its content hash."""
+    return get_extractor().extract_all_keywords(_text)
+
+
+@st.cache_data
+def decode_uploaded_text(data: bytes) -> str:
+    """Decode uploaded file contents, cached on the raw bytes."""
+    return data.decode('utf-8')
+
+
+@st.cache_data(show_spinner=False)
+def build_wordcloud(frequencies: tuple):
+    """Render a keyword word cloud image, cached on the (term, frequency) pairs."""
+    wordcloud = WordCloud(width=800, height=400, background_color='white')
+    return wordcloud.generate_from_frequencies(dict(frequencies)).to_array()
+
+
+@st.cache_data(show_spinner=False)
+def build_category_pie(category_counts: tuple):
+    """Build the keyword category pie chart, cached on the (category, count) pairs."""
+    return px.pie(
+        values=[count for _, count in category_counts],
+        names=[category for category, _ in category_counts],
+        title="Keyword Category Distribution"
+    )
+
+
+@st.cache_data(show_spinner=False)
+def build_chunk_size_chart(chunk_sizes: tuple):
+    """Build the chunk size bar chart, cached on the chunk word counts."""
+    return px.bar(
+        x=list(range(1, len(chunk_sizes) + 1)),
+        y=list(chunk_sizes),
+        title="Chunk Size Distribution",
+        labels={'x': 'Chunk Number', 'y': 'Word Count'}
+    )
+
+
 def main():
     """Main Streamlit application."""
     st.set_page_config(
@@ -73,7 +137,7 @@ def main():
     # Main content area
     if uploaded_file is not None:
         # Read the uploaded file
-        text = uploaded_file.read().decode('utf-8')
+        text = decode_uploaded_text(uploaded_file.getvalue())
         
         # Display document info
         st.subheader("Document Information")
@@ -84,9 +148,10 @@ def main():
         with col2:
             st.metric("Characters", len(text))
         with col3:
-            st.metric("Sentences", len(re.split(r'[.!?]+', text)))
+            # Count delimiter runs instead of materializing every sentence
+            st.metric("Sentences", sum(1 for _ in re.finditer(r'[.!?]+', text)) + 1)
         with col4:
-            st.metric("Paragraphs", len(text.split('\n\n')))
+            st.metric("Paragraphs", text.count('\n\n') + 1)
         
         # Process based on analysis type
         if analysis_type == "Text Chunking":
@@ -119,20 +184,13 @@ def process_text_chunking(text: str, method: str, size: int, overlap: int):
     st.subheader("Text Chunking Analysis")
     
     with st.spinner("Processing text chunks..."):
-        chunker = TextChunker(chunk_size=size, overlap=overlap, method=method)
-        chunks = chunker.process_document(text)
+        chunks = cached_chunk(text_digest(text), method, size, overlap, text)
     
     # Display chunking results
     st.success(f"Generated {len(chunks)} chunks")
     
     # Visualization
-    chunk_sizes = [chunk['word_count'] for chunk in chunks]
-    fig = px.bar(
-        x=range(1, len(chunks) + 1),
-        y=chunk_sizes,
-        title="Chunk Size Distribution",
-        labels={'x': 'Chunk Number', 'y': 'Word Count'}
-    )
+    fig = build_chunk_size_chart(tuple(chunk['word_count'] for chunk in chunks))
     st.plotly_chart(fig, use_container_width=True)
     
     # Display chunks
@@ -150,7 +208,7 @@ def process_summarization(text: str, summary_type: str, length: str):
     st.subheader("Document Summarization")
     
     with st.spinner("Generating summary..."):
-        summarizer = LegalDocumentSummarizer()
+        summarizer = get_summarizer()
         summary_data = summarizer.generate_summary(text, summary_type, length)
     
     # Display summary
@@ -179,8 +237,7 @@ def process_keyword_extraction(text: str, min_freq: int, max_keywords: int):
     st.subheader("Keyword Extraction")
     
     with st.spinner("Extracting keywords..."):
-        extractor = LegalKeywordExtractor()
-        results = extractor.extract_all_keywords(text)
+        results = cached_keywords(text_digest(text), text)
     
     # Display results
     st.success(f"Extracted {len(results['keywords'])} keywords and {len(results['key_phrases'])} phrases")
@@ -198,22 +255,14 @@ def process_keyword_extraction(text: str, min_freq: int, max_keywords: int):
     
     # Keyword visualization
     if results['keywords']:
-        # Word cloud
-        wordcloud_data = {kw['term']: kw['frequency'] for kw in results['keywords']}
-        wordcloud = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(wordcloud_data)
-        
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.imshow(wordcloud, interpolation='bilinear')
-        ax.axis('off')
-        st.pyplot(fig)
+        # Word cloud, rendered only when requested
+        with st.expander("Show word cloud"):
+            wordcloud_data = tuple((kw['term'], kw['frequency']) for kw in results['keywords'])
+            st.image(build_wordcloud(wordcloud_data), use_column_width=True)
         
         # Category distribution
         category_counts = results['statistics']['category_distribution']
-        fig_pie = px.pie(
-            values=list(category_counts.values()),
-            names=list(category_counts.keys()),
-            title="Keyword Category Distribution"
-        )
+        fig_pie = build_category_pie(tuple(category_counts.items()))
         st.plotly_chart(fig_pie, use_container_width=True)
     
     # Display keywords
@@ -239,27 +288,30 @@ def process_complete_analysis(text: str, chunk_method: str, chunk_size: int, chu
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    # Text chunking
-    status_text.text("Processing text chunks...")
-    chunker = TextChunker(chunk_size=chunk_size, overlap=chunk_overlap, method=chunk_method)
-    chunks = chunker.process_document(text)
-    progress_bar.progress(25)
-    
-    # Summarization
-    status_text.text("Generating summary...")
-    summarizer = LegalDocumentSummarizer()
-    summary_data = summarizer.generate_summary(text, summary_type, summary_length)
-    progress_bar.progress(50)
+    # Load shared resources on the script thread before fanning out
+    status_text.text("Loading models...")
+    get_chunker(chunk_size, chunk_overlap, chunk_method)
+    summarizer = get_summarizer()
+    get_extractor()
+    text_hash = text_digest(text)
+    
+    # Chunking, summarization and keyword extraction are independent, so run them concurrently
+    status_text.text("Running analysis...")
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            executor.submit(cached_chunk, text_hash, chunk_method, chunk_size, chunk_overlap, text): "Text chunking",
+            executor.submit(summarizer.generate_summary, text, summary_type, summary_length): "Summarization",
+            executor.submit(cached_keywords, text_hash, text): "Keyword extraction"
+        }
+        
+        for completed, future in enumerate(as_completed(futures), start=1):
+            status_text.text(f"{futures[future]} complete...")
+            progress_bar.progress(int(completed / len(futures) * 100))
     
-    # Keyword extraction
-    status_text.text("Extracting keywords...")
-    extractor = LegalKeywordExtractor()
-    keyword_results = extractor.extract_all_keywords(text)
-    progress_bar.progress(75)
+    chunks, summary_data, keyword_results = (future.result() for future in futures)
     
     # Complete
     status_text.text("Analysis complete!")
-    progress_bar.progress(100)
     
     # Display results in tabs
     tab1, tab2, tab3 = st.tabs(["Summary", "Keywords", "Chunks"])
@@ -7,9 +7,33 @@ Supports word-based, sentence-based, and paragraph-based chunking with overlap o
 
 import re
 import argparse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from pathlib import Path
 
+import numpy as np
+
+
+# Precompiled patterns
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n')
+
+
+def _count_sentences(text: str) -> int:
+    """
+    Count sentences the way len(_SENT_SPLIT_RE.split(text)) does, without building the list.
+    
+    Args:
+        text: Text to count
+        
+    Returns:
+        Number of pieces the text splits into at runs of '.', '!' and '?'
+    """
+    # With only isolated periods every period ends a run, so counting is exact;
+    # anything else (ellipses, '!', '?') falls back to the regex
+    if '!' in text or '?' in text or '..' in text:
+        return len(_SENT_SPLIT_RE.split(text))
+    return text.count('.') + 1
+
 
 class TextChunker:
     """A class for chunking text documents using various methods."""
@@ -27,6 +51,24 @@ class TextChunker:
         self.overlap = overlap
         self.method = method
     
+    def chunk_bounds(self, total: int) -> Tuple[List[int], List[int]]:
+        """
+        Compute the start and end unit indices of every chunk.
+        
+        Args:
+            total: Number of units (words/sentences/paragraphs) in the document
+            
+        Returns:
+            Tuple of (start indices, end indices)
+        """
+        step = self.chunk_size - self.overlap
+        if step <= 0:
+            raise ValueError("Overlap must be smaller than chunk size")
+        
+        starts = np.arange(0, total, step)
+        ends = np.minimum(starts + self.chunk_size, total)
+        return starts.tolist(), ends.tolist()
+    
     def chunk_by_words(self, text: str) -> List[Dict[str, Any]]:
         """
         Chunk text by words.
@@ -38,23 +80,22 @@ class TextChunker:
             List of dictionaries containing chunk information
         """
         words = text.split()
-        chunks = []
+        starts, ends = self.chunk_bounds(len(words))
         
-        for i in range(0, len(words), self.chunk_size - self.overlap):
-            chunk_words = words[i:i + self.chunk_size]
-            content = ' '.join(chunk_words)
-            
-            if content.strip():
-                chunks.append({
-                    'id': len(chunks) + 1,
-                    'content': content.strip(),
-                    'word_count': len(chunk_words),
-                    'sentence_count': len(re.split(r'[.!?]+', content)),
-                    'start_index': i,
-                    'end_index': i + len(chunk_words)
-                })
+        # Joining is the only per-chunk string work; words carry no whitespace to strip
+        contents = [' '.join(words[start:end]) for start, end in zip(starts, ends)]
         
-        return chunks
+        return [
+            {
+                'id': chunk_id,
+                'content': content,
+                'word_count': end - start,
+                'sentence_count': _count_sentences(content),
+                'start_index': start,
+                'end_index': end
+            }
+            for chunk_id, (content, start, end) in enumerate(zip(contents, starts, ends), start=1)
+        ]
     
     def chunk_by_sentences(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -66,25 +107,22 @@ class TextChunker:
         Returns:
             List of dictionaries containing chunk information
         """
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENT_SPLIT_RE.split(text)
         sentences = [s.strip() for s in sentences if s.strip()]
-        chunks = []
-        
-        for i in range(0, len(sentences), self.chunk_size - self.overlap):
-            chunk_sentences = sentences[i:i + self.chunk_size]
-            content = '. '.join(chunk_sentences) + '.'
-            
-            if content.strip():
-                chunks.append({
-                    'id': len(chunks) + 1,
-                    'content': content.strip(),
-                    'word_count': len(content.split()),
-                    'sentence_count': len(chunk_sentences),
-                    'start_index': i,
-                    'end_index': i + len(chunk_sentences)
-                })
+        starts, ends = self.chunk_bounds(len(sentences))
+        contents = ['. '.join(sentences[start:end]) + '.' for start, end in zip(starts, ends)]
         
-        return chunks
+        return [
+            {
+                'id': chunk_id,
+                'content': content,
+                'word_count': len(content.split()),
+                'sentence_count': end - start,
+                'start_index': start,
+                'end_index': end
+            }
+            for chunk_id, (content, start, end) in enumerate(zip(contents, starts, ends), start=1)
+        ]
     
     def chunk_by_paragraphs(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -96,26 +134,23 @@ class TextChunker:
         Returns:
             List of dictionaries containing chunk information
         """
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = _PARAGRAPH_SPLIT_RE.split(text)
         paragraphs = [p.strip() for p in paragraphs if p.strip()]
-        chunks = []
+        starts, ends = self.chunk_bounds(len(paragraphs))
+        contents = ['\n\n'.join(paragraphs[start:end]) for start, end in zip(starts, ends)]
         
-        for i in range(0, len(paragraphs), self.chunk_size - self.overlap):
-            chunk_paragraphs = paragraphs[i:i + self.chunk_size]
-            content = '\n\n'.join(chunk_paragraphs)
-            
-            if content.strip():
-                chunks.append({
-                    'id': len(chunks) + 1,
-                    'content': content.strip(),
-                    'word_count': len(content.split()),
-                    'sentence_count': len(re.split(r'[.!?]+', content)),
-                    'paragraph_count': len(chunk_paragraphs),
-                    'start_index': i,
-                    'end_index': i + len(chunk_paragraphs)
-                })
-        
-        return chunks
+        return [
+            {
+                'id': chunk_id,
+                'content': content,
+                'word_count': len(content.split()),
+                'sentence_count': _count_sentences(content),
+                'paragraph_count': end - start,
+                'start_index': start,
+                'end_index': end
+            }
+            for chunk_id, (content, start, end) in enumerate(zip(contents, starts, ends), start=1)
+        ]
     
     def process_document(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -145,23 +180,28 @@ class TextChunker:
             output_path: Path to save the output file
             original_filename: Original filename for reference
         """
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"TEXT CHUNKING REPORT\n")
-            f.write(f"{'=' * 50}\n\n")
-            f.write(f"Original Document: {original_filename}\n")
-            f.write(f"Chunking Method: {self.method}\n")
-            f.write(f"Chunk Size: {self.chunk_size}\n")
-            f.write(f"Overlap: {self.overlap}\n")
-            f.write(f"Total Chunks: {len(chunks)}\n\n")
-            
-            for chunk in chunks:
-                f.write(f"CHUNK {chunk['id']}\n")
-                f.write(f"Words: {chunk['word_count']} | Sentences: {chunk['sentence_count']}\n")
-                if 'paragraph_count' in chunk:
-                    f.write(f"Paragraphs: {chunk['paragraph_count']}\n")
-                f.write(f"Range: {chunk['start_index']}-{chunk['end_index']}\n\n")
-                f.write(f"{chunk['content']}\n\n")
-                f.write(f"{'=' * 50}\n\n")
+        parts = [
+            f"TEXT CHUNKING REPORT\n",
+            f"{'=' * 50}\n\n",
+            f"Original Document: {original_filename}\n",
+            f"Chunking Method: {self.method}\n",
+            f"Chunk Size: {self.chunk_size}\n",
+            f"Overlap: {self.overlap}\n",
+            f"Total Chunks: {len(chunks)}\n\n"
+        ]
+        
+        for chunk in chunks:
+            parts.append(f"CHUNK {chunk['id']}\n")
+            parts.append(f"Words: {chunk['word_count']} | Sentences: {chunk['sentence_count']}\n")
+            if 'paragraph_count' in chunk:
+                parts.append(f"Paragraphs: {chunk['paragraph_count']}\n")
+            parts.append(f"Range: {chunk['start_index']}-{chunk['end_index']}\n\n")
+            parts.append(f"{chunk['content']}\n\n")
+            parts.append(f"{'=' * 50}\n\n")
+        
+        # Build the report in memory and write it in one call
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(''.join(parts))
 
 
 def main():